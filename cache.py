@@ -0,0 +1,74 @@
+"""
+Cache module - defines helpers for caching endpoint responses
+in Redis and invalidating them when the data changes.
+"""
+import inspect
+from functools import wraps
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from redis.exceptions import RedisError
+from db import redis_client
+
+GENERATION_KEY = "cache:generation"
+
+
+def cached(key_fn, ttl: int = 300):
+    """
+    Decorator that caches the JSON-encoded response of an endpoint.
+    Keys are prefixed with the cache generation read before the endpoint
+    runs, so a response computed from data that was replaced while the
+    request was in flight is stored under a generation nobody reads.
+
+    Parameters:
+    ----------
+        key_fn (callable): Builds the cache key from the endpoint's
+                    keyword arguments that it names as parameters.
+        ttl (int): Time to live of the cached response, in seconds.
+
+    Returns:
+    -------
+        callable: The decorated endpoint.
+    """
+    key_params = inspect.signature(key_fn).parameters
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            if redis_client is None:
+                return await func(*args, **kwargs)
+            key = key_fn(**{name: kwargs.get(name) for name in key_params})
+            try:
+                generation = int(await redis_client.get(GENERATION_KEY) or 0)
+                key = f"{generation}:{key}"
+                body = await redis_client.get(key)
+            except RedisError:
+                return await func(*args, **kwargs)
+            if body is None:
+                body = orjson.dumps(jsonable_encoder(
+                    await func(*args, **kwargs)))
+                try:
+                    await redis_client.set(key, body, ex=ttl)
+                except RedisError:
+                    pass
+            return Response(content=body, media_type="application/json")
+        return wrapper
+    return decorator
+
+
+async def invalidate_cache():
+    """
+    Invalidates all cached country list and status responses by bumping
+    the cache generation. Entries of older generations are never read
+    again and expire with their TTL.
+
+    Returns:
+    -------
+        None
+    """
+    if redis_client is None:
+        return
+    try:
+        await redis_client.incr(GENERATION_KEY)
+    except RedisError:
+        pass
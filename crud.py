@@ -3,79 +3,174 @@ CRUD module - defines functions for creating, reading,
 updating, and deleting country records in the database.
 """
 from datetime import datetime
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from cachetools import TTLCache
+from sqlalchemy import func, lambda_stmt, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from models import Country
+from schemas import CountryResponse
 
+_COUNTRY_CACHE = TTLCache(maxsize=512, ttl=300)
 
-def create_or_update_country(session: Session, country_data: dict):
+
+def _upsert_country_no_commit(session: AsyncSession, country_data: dict,
+                              existing_country: Country = None):
     """
-    Create or update a country in the database.
+    Stage the creation or update of a country without committing.
 
     Parameters:
     ----------
-        session (Session): Database session.
+        session (AsyncSession): Database session.
         country_data (dict): Data for the country to be created or updated.
+        existing_country (Country, optional): The stored country to update,
+                            or None to create a new one.
 
     Returns:
     -------
         Country: The created or updated country object.
     """
-    existing_country = session.query(Country).filter(
-        func.lower(Country.name) == func.lower(country_data["name"])
-    ).first()
-
     if existing_country:
         for key, value in country_data.items():
             setattr(existing_country, key, value)
-        existing_country.last_refreshed_at = datetime.utcnow()
-        try:
-            session.commit()
-        except Exception as e:
-            session.rollback()
-            raise e
-        session.refresh(existing_country)
         return existing_country
 
     new_country = Country(**country_data)
     session.add(new_country)
+    return new_country
+
+
+async def create_or_update_country(session: AsyncSession,
+                                   country_data: dict,
+                                   return_row: bool = False):
+    """
+    Create or update a country in the database.
+
+    Parameters:
+    ----------
+        session (AsyncSession): Database session.
+        country_data (dict): Data for the country to be created or updated.
+        return_row (bool, optional): Reload the row after committing so
+                            server-generated values are populated.
+                            Defaults to False.
+
+    Returns:
+    -------
+        Country: The created or updated country object.
+    """
+    country_data = {"last_refreshed_at": datetime.now(), **country_data}
+    existing_country = await _select_country_by_name(session,
+                                                     country_data["name"])
+    country = _upsert_country_no_commit(session, country_data,
+                                        existing_country)
     try:
-        session.commit()
+        await session.commit()
     except Exception as e:
-        session.rollback()
+        await session.rollback()
         raise e
-    session.refresh(new_country)
-    return new_country
+    clear_country_cache()
+    if return_row:
+        await session.refresh(country)
+    return country
 
 
-def get_country_by_name(session: Session, name: str):
+async def bulk_upsert_countries(session: AsyncSession, rows: list):
     """
-    Retrieve a country by its name.
+    Create or update many countries in a single statement using
+    MySQL's `INSERT ... ON DUPLICATE KEY UPDATE`, keyed on the
+    unique country name. Does not commit; the caller owns the transaction.
 
     Parameters:
     ----------
-        session (Session): Database session.
+        session (AsyncSession): Database session.
+        rows (list): Country data dictionaries to be created or updated.
+
+    Returns:
+    -------
+        None
+    """
+    if not rows:
+        return
+    stmt = mysql_insert(Country).values(rows)
+    stmt = stmt.on_duplicate_key_update(
+        capital=stmt.inserted.capital,
+        region=stmt.inserted.region,
+        population=stmt.inserted.population,
+        currency_code=stmt.inserted.currency_code,
+        exchange_rate=stmt.inserted.exchange_rate,
+        estimated_gdp=stmt.inserted.estimated_gdp,
+        flag_url=stmt.inserted.flag_url,
+        last_refreshed_at=stmt.inserted.last_refreshed_at,
+    )
+    await session.execute(stmt)
+
+
+def clear_country_cache():
+    """
+    Clears the in-process cache of countries looked up by name.
+
+    Returns:
+    -------
+        None
+    """
+    _COUNTRY_CACHE.clear()
+
+
+async def _select_country_by_name(session: AsyncSession, name: str):
+    """
+    Retrieve a country by its name, bypassing the cache.
+
+    Parameters:
+    ----------
+        session (AsyncSession): Database session.
         name (str): Name of the country to retrieve.
 
     Returns:
     -------
         Country: The country object if found, else None.
     """
-    return session.query(Country).filter(
-        func.lower(Country.name) == func.lower(name)).first()
+    result = await session.execute(
+        select(Country).where(Country.name == name))
+    return result.scalars().first()
+
 
+async def get_country_by_name(session: AsyncSession, name: str):
+    """
+    Retrieve a country by its name, serving repeated lookups
+    from an in-process cache for up to 5 minutes. The cache holds
+    frozen response models, so nothing tied to a session is shared
+    between requests.
 
-def get_countries(session: Session,
-                  region: str = None,
-                  currency_code: str = None,
-                  sort_by: str = None,
-                  sort_order: str = "asc"):
+    Parameters:
+    ----------
+        session (AsyncSession): Database session.
+        name (str): Name of the country to retrieve.
+
+    Returns:
+    -------
+        CountryResponse: The country if found, else None.
+    """
+    key = name.lower()
+    country = _COUNTRY_CACHE.get(key)
+    if country is None:
+        row = await _select_country_by_name(session, name)
+        if row is None:
+            return None
+        country = CountryResponse.model_validate(row)
+        _COUNTRY_CACHE[key] = country
+    return country
+
+
+async def get_countries(session: AsyncSession,
+                        region: str = None,
+                        currency_code: str = None,
+                        sort_by: str = None,
+                        sort_order: str = "asc"):
     """
     Retrieves all countries from the database.
 
     Parameters:
     ----------
-        session (Session): Database session.
+        session (AsyncSession): Database session.
         region (str, optional): Filter by region. Defaults to None.
         currency_code (str, optional): Filter by currency code.
                             Defaults to None.
@@ -84,57 +179,68 @@ def get_countries(session: Session,
 
     Returns:
     -------
-        List[Country]: A list of all countries in the database.
+        List[RowMapping]: The matching countries as column mappings.
     """
-    query = session.query(Country)
+    stmt = lambda_stmt(lambda: select(
+        Country.id, Country.name, Country.capital, Country.region,
+        Country.population, Country.currency_code, Country.exchange_rate,
+        Country.estimated_gdp, Country.flag_url, Country.last_refreshed_at))
     if region:
-        query = query.filter(func.lower(Country.region) == func.lower(region))
+        stmt += lambda s: s.where(Country.region == region)
     if currency_code:
-        query = query.filter(func.lower(Country.currency_code) ==
-                             func.lower(currency_code))
+        stmt += lambda s: s.where(Country.currency_code == currency_code)
     if sort_by and hasattr(Country, sort_by):
+        column = getattr(Country, sort_by)
         if sort_order == "asc":
-            query = query.order_by(getattr(Country, sort_by).asc())
+            stmt += lambda s: s.order_by(column.asc())
         else:
-            query = query.order_by(getattr(Country, sort_by).desc())
-    return query.all()
+            stmt += lambda s: s.order_by(column.desc())
+    result = await session.execute(stmt)
+    return result.mappings().all()
 
 
-def delete_country(session: Session, name: str):
+async def delete_country(session: AsyncSession, name: str):
     """
     Deletes a country from the database by its name.
 
     Parameters:
     ----------
-        session (Session): Database session.
+        session (AsyncSession): Database session.
         name (str): Name of the country to delete.
 
     Returns:
     -------
         bool: True if the country was deleted, False if not found.
     """
-    country = get_country_by_name(session, name)
+    country = await _select_country_by_name(session, name)
     if country:
-        session.delete(country)
+        await session.delete(country)
         try:
-            session.commit()
+            await session.commit()
         except Exception as e:
-            session.rollback()
+            await session.rollback()
             raise e
+        clear_country_cache()
         return True
     return False
 
 
-def count_countries(session: Session):
+async def get_status_summary(session: AsyncSession):
     """
-    Counts the total number of countries in the database.
+    Counts the countries in the database and finds the latest refresh
+    timestamp in a single query.
 
     Parameters:
     ----------
-        session (Session): Database session.
+        session (AsyncSession): Database session.
 
     Returns:
     -------
-        int: The total number of countries.
+        tuple: The total number of countries and the last refreshed
+                    timestamp, or None if there are no countries.
     """
-    return session.query(Country).count()
+    # pylint: disable-next=not-callable
+    stmt = select(func.count(Country.id),
+                  func.max(Country.last_refreshed_at))
+    result = await session.execute(stmt)
+    return result.one()
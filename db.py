@@ -3,8 +3,9 @@ Database connection module
 """
 import os
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
 
 load_dotenv()
 
@@ -13,20 +14,33 @@ MYSQL_PORT = os.getenv("MYSQL_PORT")
 MYSQL_USER = os.getenv("MYSQL_USER")
 MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD")
 MYSQL_DATABASE = os.getenv("MYSQL_DATABASE")
+# Each worker process keeps its own pool of up to
+# DB_POOL_SIZE + DB_MAX_OVERFLOW connections; keep that at or below
+# MySQL's max_connections divided by the number of uvicorn workers.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+REDIS_URL = os.getenv("REDIS_URL")
 
-DATABASE_URL = f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DATABASE}"
+DATABASE_URL = f"mysql+aiomysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DATABASE}"
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-SESSION_LOCAL = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_async_engine(DATABASE_URL, pool_pre_ping=True,
+                             pool_size=DB_POOL_SIZE,
+                             max_overflow=DB_MAX_OVERFLOW,
+                             pool_recycle=1800, pool_timeout=10,
+                             query_cache_size=1200,
+                             connect_args={"charset": "utf8mb4",
+                                           "autocommit": False})
+SESSION_LOCAL = async_sessionmaker(bind=engine, autoflush=False,
+                                   expire_on_commit=False)
 Base = declarative_base()
 
+# Query result cache; disabled when REDIS_URL is not configured.
+redis_client = Redis.from_url(REDIS_URL) if REDIS_URL else None
 
-def get_db():
+
+async def get_db():
     """
     Get a database session.
     """
-    db = SESSION_LOCAL()
-    try:
+    async with SESSION_LOCAL() as db:
         yield db
-    finally:
-        db.close()
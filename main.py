@@ -9,24 +9,29 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError, \
         HTTPException as StarletteHTTPException
-from fastapi.responses import JSONResponse
-from db import Base, engine
-from routes.countries import router as countries_router
+from fastapi.responses import JSONResponse, ORJSONResponse
+from db import Base, engine, redis_client
+from routes.countries import http_client, router as countries_router
 from routes.status import router as status_router
 
 
 @asynccontextmanager
-async def lifespan():
+async def lifespan(_app: FastAPI):
     """
     Lifespan event handler for the FastAPI application.
     Creates the db tables if they don't exist.
     Yields control to the application, allowing it to run.
-    Also handles shutdown events.
+    Also handles shutdown events, closing the shared HTTP and Redis
+    clients.
     """
-    Base.metadata.create_all(bind=engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
     yield
+    await http_client.aclose()
+    if redis_client is not None:
+        await redis_client.aclose()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.include_router(countries_router)
 app.include_router(status_router)
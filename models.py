@@ -2,7 +2,7 @@
 Country model
 """
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index
 from db import Base
 
 
@@ -26,16 +26,21 @@ class Country(Base):
     """
 
     __tablename__ = "tb_countries"
+    __table_args__ = (
+        Index("ix_country_region_gdp", "region", "estimated_gdp"),
+        Index("ix_country_last_refreshed", "last_refreshed_at"),
+    )
 
     id = Column(Integer, primary_key=True, unique=True, autoincrement=True)
-    name = Column(String(100), index=True, unique=True, nullable=False)
+    name = Column(String(100, collation="utf8mb4_unicode_ci"),
+                  index=True, unique=True, nullable=False)
     capital = Column(String(100), nullable=True)
-    region = Column(String(50), nullable=True)
+    region = Column(String(50, collation="utf8mb4_unicode_ci"),
+                    nullable=True)
     population = Column(Integer, nullable=False)
-    currency_code = Column(String(10), nullable=True)
+    currency_code = Column(String(10, collation="utf8mb4_unicode_ci"),
+                           index=True, nullable=True)
     exchange_rate = Column(Float, nullable=True)
     estimated_gdp = Column(Float, nullable=True)
     flag_url = Column(String(255), nullable=True)
-    last_refreshed_at = Column(DateTime,
-                               default=datetime.now,
-                               onupdate=datetime.now)
+    last_refreshed_at = Column(DateTime, default=datetime.now)
@@ -1,19 +1,26 @@
 """
 Module for Fast API routes that have `/countries` prefix.
 """
+import asyncio
 import os
 from datetime import datetime
 from typing import List
-import requests
+import httpx
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from crud import (delete_country as crud_delete_country,
+from cache import cached, invalidate_cache
+from crud import (bulk_upsert_countries, clear_country_cache,
+                  delete_country as crud_delete_country,
                   get_countries as crud_get_countries, get_country_by_name)
 from db import get_db
 from schemas import CountryResponse
-from utils import generate_summary_image, _process_single_country_data
+from utils import (generate_summary_image, _build_country_rows,
+                   _iter_json_array_chunks)
 
 router = APIRouter(prefix="/countries", tags=["countries"])
 
@@ -21,6 +28,11 @@ COUNTRIES_API_URL = "https://restcountries.com/v2/all?" \
                      "fields=name,capital,region,population,flag,currencies"
 EXCHANGE_API_URL = "https://open.er-api.com/v6/latest/USD"
 
+_COUNTRY_LIST_ADAPTER = TypeAdapter(List[CountryResponse])
+
+http_client = httpx.AsyncClient(timeout=15, http2=True,
+                                headers={"Accept-Encoding": "gzip"})
+
 
 @router.get("/image", response_class=FileResponse)
 def get_summary_image():
@@ -38,8 +50,64 @@ def get_summary_image():
     return FileResponse(image_path, media_type="image/png")
 
 
+async def _upsert_chunks(db: AsyncSession, queue: asyncio.Queue):
+    """
+    Consumer that upserts chunks of country rows from the queue
+    until it receives None.
+
+    Parameters:
+    ----------
+        db (AsyncSession): Database session.
+        queue (asyncio.Queue): Queue of country row lists.
+
+    Returns:
+    -------
+        None
+    """
+    while (chunk := await queue.get()) is not None:
+        await bulk_upsert_countries(db, chunk)
+
+
+async def _upsert_streamed_countries(db: AsyncSession,
+                                     countries_response: httpx.Response,
+                                     exchange_data: dict,
+                                     refreshed_at: datetime):
+    """
+    Builds country rows from the streamed countries payload and upserts
+    them chunk by chunk in a single transaction, so database writes
+    overlap with the rest of the download.
+
+    Parameters:
+    ----------
+        db (AsyncSession): Database session.
+        countries_response (httpx.Response): Streamed countries response.
+        exchange_data (dict): Exchange rate data dictionary.
+        refreshed_at (datetime): Timestamp shared by every row.
+
+    Returns:
+    -------
+        list: Column values for every refreshed country.
+    """
+    rows = []
+    queue = asyncio.Queue()
+    async with db.begin():
+        consumer = asyncio.create_task(_upsert_chunks(db, queue))
+        try:
+            async for chunk in _iter_json_array_chunks(countries_response):
+                if consumer.done():
+                    break
+                chunk_rows = _build_country_rows(chunk, exchange_data,
+                                                 refreshed_at)
+                rows.extend(chunk_rows)
+                queue.put_nowait(chunk_rows)
+        finally:
+            queue.put_nowait(None)
+            await consumer
+    return rows
+
+
 @router.post("/refresh", response_model=dict)
-def refresh_countries(db: Session = Depends(get_db)):
+async def refresh_countries(db: AsyncSession = Depends(get_db)):
     """
     Refresh the countries data by fetching from external APIs
     and updating the database.
@@ -53,12 +121,20 @@ def refresh_countries(db: Session = Depends(get_db)):
         HTTPException: If there is an error fetching data
         from the external APIs.
     """
+    now = datetime.now()
+    exchange_task = asyncio.create_task(http_client.get(EXCHANGE_API_URL))
     try:
-        countries_response = requests.get(COUNTRIES_API_URL, timeout=15)
-        exchange_response = requests.get(EXCHANGE_API_URL, timeout=15)
-        countries_response.raise_for_status()
-        exchange_response.raise_for_status()
-    except requests.RequestException as e:
+        async with http_client.stream(
+                "GET", COUNTRIES_API_URL) as countries_response:
+            countries_response.raise_for_status()
+            exchange_response = await exchange_task
+            exchange_response.raise_for_status()
+            exchange_data = orjson.loads(
+                exchange_response.content).get("rates", {})
+            rows = await _upsert_streamed_countries(
+                db, countries_response, exchange_data, now)
+    except httpx.HTTPError as e:
+        exchange_task.cancel()
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail={
@@ -66,32 +142,33 @@ def refresh_countries(db: Session = Depends(get_db)):
                 "details": str(e)
             }
         ) from e
+    clear_country_cache()
+    await invalidate_cache()
 
-    countries_data = countries_response.json()
-    exchange_data = exchange_response.json().get("rates", {})
-    timestamp = datetime.now().isoformat()
-
-    for country in countries_data:
-        _process_single_country_data(db, country, exchange_data)
-
+    top_countries = sorted(
+        (row for row in rows if row["estimated_gdp"]),
+        key=lambda row: row["estimated_gdp"], reverse=True)[:5]
     try:
-        generate_summary_image(db)
+        await run_in_threadpool(generate_summary_image, len(rows),
+                                top_countries, now.isoformat())
     except Exception as e:
         print(f"Error generating summary image: {e}")
 
     return {
         "message": "Countries refreshed successfully",
-        "total_countries": len(countries_data),
-        "last_refreshed_at": timestamp
+        "total_countries": len(rows),
+        "last_refreshed_at": now.isoformat()
     }
 
 
 @router.get("", response_model=List[CountryResponse])
-def list_countries(
+@cached(key_fn=lambda region, currency, sort:
+        f"countries:{region}:{currency}:{sort}", ttl=300)
+async def list_countries(
     region: str = None,
     currency: str = None,
     sort: str = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Gets a list of countries with optional filters
@@ -122,13 +199,13 @@ def list_countries(
                 detail={"error": "Validation failed",
                         "details": {"sort": "must end with _asc or _desc"}}
             )
-    countries: list = crud_get_countries(db, region, currency,
-                                         sort_by, sort_order)
-    return [CountryResponse.from_orm(c) for c in countries]
+    countries: list = await crud_get_countries(db, region, currency,
+                                               sort_by, sort_order)
+    return _COUNTRY_LIST_ADAPTER.validate_python(countries)
 
 
 @router.get("/{name}", response_model=CountryResponse)
-def get_country(name: str, db: Session = Depends(get_db)):
+async def get_country(name: str, db: AsyncSession = Depends(get_db)):
     """
     Gets a single country by its name.
 
@@ -144,7 +221,7 @@ def get_country(name: str, db: Session = Depends(get_db)):
     ------
         HTTPException: If the country is not found, raises 404 Not Found.
     """
-    country = get_country_by_name(db, name)
+    country = await get_country_by_name(db, name)
     if not country:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail={"error": "Country not found"})
@@ -152,7 +229,8 @@ def get_country(name: str, db: Session = Depends(get_db)):
 
 
 @router.delete("/{name}", response_model=dict)
-def delete_country_route(name: str, db: Session = Depends(get_db)):
+async def delete_country_route(name: str,
+                               db: AsyncSession = Depends(get_db)):
     """
     Deletes a country by its name.
 
@@ -168,9 +246,10 @@ def delete_country_route(name: str, db: Session = Depends(get_db)):
     ------
         HTTPException: If the country is not found, raises 404 Not Found.
     """
-    deleted = crud_delete_country(db, name)
+    deleted = await crud_delete_country(db, name)
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail={"error": "Country not found"})
+    await invalidate_cache()
     return {"status": "success",
             "message": f"Country '{name}' deleted successfully"}
@@ -2,33 +2,32 @@
 Status Route Module
 """
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from models import Country
+from sqlalchemy.ext.asyncio import AsyncSession
+from cache import cached
 from db import get_db
-from crud import count_countries
+from crud import get_status_summary
 
 router = APIRouter(tags=["status"])
 
 
 @router.get("/status", response_model=dict)
-def get_status(db: Session = Depends(get_db)):
+@cached(key_fn=lambda: "status", ttl=300)
+async def get_status(db: AsyncSession = Depends(get_db)):
     """
     Gets total number of countries in the database
     and the last refreshed timestamp.
 
     Parameters:
     ----------
-        db (Session): Database session.
+        db (AsyncSession): Database session.
 
     Returns:
     -------
         dict: A dictionary containing the status of the API.
     """
-    total_countries = count_countries(db)
-    last_refresh = db.query(Country.last_refreshed_at).order_by(
-        Country.last_refreshed_at.desc()).first()
+    total_countries, last_refresh = await get_status_summary(db)
     return {
         "total_countries": total_countries,
-        "last_refreshed_at": last_refresh[0].isoformat()
+        "last_refreshed_at": last_refresh.isoformat()
         if last_refresh else None
     }
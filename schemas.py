@@ -41,4 +41,4 @@ class CountryResponse(CountryBase):
     """
     id: int
     last_refreshed_at: datetime
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "frozen": True}
@@ -4,20 +4,23 @@ Utility functions module
 import os
 import random
 from datetime import datetime
+import ijson
 from PIL import Image, ImageDraw, ImageFont
-from sqlalchemy.orm import Session
-from models import Country
-from crud import create_or_update_country
 
 
-def generate_summary_image(db: Session, image_path="cache/summary.png"):
+def generate_summary_image(total_countries: int,
+                           top_countries: list,
+                           last_refresh_iso: str,
+                           image_path="cache/summary.png"):
     """
     Generates a summary image of the countries data
     and saves it to the specified path.
 
     Parameters:
     ----------
-        countries_data (list): List of country data dictionaries.
+        total_countries (int): Total number of countries.
+        top_countries (list): Country rows with the highest estimated GDP.
+        last_refresh_iso (str): ISO timestamp of the last refresh.
         image_path (str): Path where the summary image will be saved.
 
     Returns:
@@ -27,25 +30,6 @@ def generate_summary_image(db: Session, image_path="cache/summary.png"):
     if not os.path.exists("cache"):
         os.makedirs("cache")
 
-    total_countries = db.query(Country).count()
-    top_countries = (
-        db.query(Country)
-        .filter(Country.estimated_gdp.isnot(None))
-        .order_by(Country.estimated_gdp.desc())
-        .limit(5)
-        .all()
-        )
-
-    last_refresh = (
-        db.query(Country.last_refreshed_at)
-        .order_by(Country.last_refreshed_at.desc())
-        .first()
-    )
-
-    last_refresh = (
-        last_refresh[0].isoformat() if last_refresh else "N/A"
-    )
-
     img = Image.new("RGB", (800, 600), color=(255, 255, 255))
     draw = ImageDraw.Draw(img)
 
@@ -60,15 +44,15 @@ def generate_summary_image(db: Session, image_path="cache/summary.png"):
               fill="black", font=font_title)
     draw.text((20, 80), f"Total Countries: {total_countries}",
               fill="black", font=font_text)
-    draw.text((20, 120), f"Last Refreshed: {last_refresh}",
+    draw.text((20, 120), f"Last Refreshed: {last_refresh_iso}",
               fill="black", font=font_text)
     draw.text((20, 170), "Top 5 by Estimated GDP:",
               fill="black", font=font_text)
 
     y = 200
     for idx, country in enumerate(top_countries, start=1):
-        text = f"{idx}. {country.name} — {round(
-            country.estimated_gdp or 0, 2):,}"
+        gdp = round(country["estimated_gdp"] or 0, 2)
+        text = f"{idx}. {country['name']} — {gdp:,}"
         draw.text((40, y), text, fill="black", font=font_text)
         y += 30
 
@@ -76,46 +60,67 @@ def generate_summary_image(db: Session, image_path="cache/summary.png"):
     return image_path
 
 
-def _process_single_country_data(db: Session,
-                                 country: dict,
-                                 exchange_data: dict):
+def _build_country_rows(countries_data: list, exchange_data: dict,
+                        refreshed_at: datetime):
     """
-    Helper function to process and store data for a single country.
+    Helper function to build the database rows for all fetched countries
+    in a single pass.
 
     Parameters:
     ----------
-        db (Session): Database session.
-        country (dict): Country data dictionary.
+        countries_data (list): Country data dictionaries.
         exchange_data (dict): Exchange rate data dictionary.
+        refreshed_at (datetime): Timestamp shared by every row
+                    of this refresh.
 
     Returns:
     -------
-        None
+        list: Column values for each country.
+    """
+    uniform = random.uniform
+    rows = []
+    for country in countries_data:
+        currencies = country.get("currencies")
+        currency_code = currencies[0].get("code") if currencies else None
+        exchange_rate = exchange_data.get(currency_code)
+        population = country.get("population") or 0
+        rows.append({
+            "name": country.get("name"),
+            "capital": country.get("capital"),
+            "region": country.get("region"),
+            "population": population,
+            "currency_code": currency_code,
+            "exchange_rate": exchange_rate,
+            "estimated_gdp": (population * uniform(1000, 2000)
+                              / exchange_rate if exchange_rate else 0),
+            "flag_url": country.get("flag"),
+            "last_refreshed_at": refreshed_at
+        })
+    return rows
+
+
+async def _iter_json_array_chunks(response, chunk_size: int = 50):
+    """
+    Helper function to incrementally parse a streamed JSON array,
+    yielding its items in lists as they arrive.
+
+    Parameters:
+    ----------
+        response (httpx.Response): Streamed response with a JSON array body.
+        chunk_size (int): Minimum number of items per yielded list,
+                    except for the last one.
+
+    Yields:
+    ------
+        list: The next parsed items of the array.
     """
-    country_name = country.get("name")
-    capital = country.get("capital")
-    region = country.get("region")
-    population = country.get("population")
-    flag_url = country.get("flag")
-    currencies = country.get("currencies", [])
-    currency_code = currencies[0].get("code") if currencies else None
-
-    exchange_rate = (exchange_data.get(currency_code)
-                     if currency_code in exchange_data else None)
-    multiplier = random.uniform(1000, 2000)
-    estimated_gdp = ((population * multiplier) / exchange_rate
-                     if exchange_rate else 0)
-
-    country_dict = {
-        "name": country_name,
-        "capital": capital,
-        "region": region,
-        "population": population or 0,
-        "currency_code": currency_code,
-        "exchange_rate": exchange_rate,
-        "estimated_gdp": estimated_gdp,
-        "flag_url": flag_url,
-        "last_refreshed_at": datetime.now()
-    }
-
-    create_or_update_country(db, country_dict)
+    items = ijson.sendable_list()
+    parser = ijson.items_coro(items, "item")
+    async for data in response.aiter_bytes():
+        parser.send(data)
+        if len(items) >= chunk_size:
+            yield list(items)
+            del items[:]
+    parser.close()
+    if items:
+        yield list(items)